@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    In-memory LRU cache whose entries expire after a fixed time-to-live.
+    Thread-safe, since sync endpoints are served from a worker thread pool.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[1] if entry is not None else default
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+# Per-member aggregates over the full borrow history, keyed by member_id.
+member_analytics_cache = TTLCache(maxsize=10_000, ttl=30)
+member_stats_cache = TTLCache(maxsize=10_000, ttl=30)
+
+
+def invalidate_member_caches(member_id: Hashable) -> None:
+    """Drop cached aggregates for a member after its borrow history changes."""
+    member_analytics_cache.pop(member_id)
+    member_stats_cache.pop(member_id)
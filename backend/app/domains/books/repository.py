@@ -123,12 +123,15 @@ class BookRepository:
         if not cursor:
             stmt = stmt.offset(skip)
         
-        stmt = stmt.limit(limit)
+        # Fetch one extra row so the cursor is only issued when another page exists
+        stmt = stmt.limit(limit + 1)
 
         results = self.session.execute(stmt).scalars().all()
-        
+        has_next = len(results) > limit
+        results = results[:limit]
+
         next_cursor = None
-        if len(results) >= limit:
+        if has_next:
             last_item = results[-1]
             last_val = getattr(last_item, sort_field)
             if isinstance(last_val, datetime):
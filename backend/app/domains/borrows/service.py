@@ -20,6 +20,7 @@ from app.core.exceptions import (
     ActiveBorrowExistsError,
 )
 from app.core.decorators import db_retry, measure_borrow_metrics
+from app.core.cache import invalidate_member_caches
 from app.shared.audit import log_audit_event
 
 
@@ -96,6 +97,7 @@ class BorrowService:
             self.uow.session.add(borrow_record)
             self.uow.commit()
             self.uow.refresh(borrow_record)
+            invalidate_member_caches(member_id)
             
             if self.background_tasks:
                 self.background_tasks.add_task(
@@ -133,6 +135,7 @@ class BorrowService:
             book.available_copies += 1  # type: ignore
             self.uow.commit()
             self.uow.refresh(borrow_record)
+            invalidate_member_caches(borrow_record.member_id)
             
             if self.background_tasks:
                 self.background_tasks.add_task(
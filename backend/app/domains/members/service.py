@@ -18,6 +18,7 @@ from app.domains.members.schemas import (
     MemberAnalyticsResponse,
 )
 from app.core.exceptions import MemberNotFoundError
+from app.core.cache import member_analytics_cache, member_stats_cache
 from app.shared.audit import log_audit_event
 
 
@@ -160,7 +161,10 @@ class MemberService:
             if not member:
                 raise MemberNotFoundError("Member not found.")
 
-            stats = self.uow.members.get_core_stats(member_id)
+            stats = member_stats_cache.get(member_id)
+            if stats is None:
+                stats = self.uow.members.get_core_stats(member_id)
+                member_stats_cache.set(member_id, stats)
             duration = datetime.now(timezone.utc).date() - member.created_at.date()
             risk_level = self.uow.analytics.calculate_risk_level(stats["overdue_rate_percent"])
 
@@ -235,8 +239,14 @@ class MemberService:
         )
 
     def get_member_analytics(self, member_id: UUID) -> MemberAnalyticsResponse:
-        with self.uow:
-            return self.uow.analytics.get_member_analytics(member_id)
+        """Return member analytics, served from a short-lived cache when possible."""
+        analytics = member_analytics_cache.get(member_id)
+        if analytics is None:
+            with self.uow:
+                analytics = self.uow.analytics.get_member_analytics(member_id)
+            member_analytics_cache.set(member_id, analytics)
+        # Callers get their own copy so they can never mutate the cached entry.
+        return analytics.model_copy(deep=True)
 
     def export_members_csv(self) -> str:
         with self.uow:
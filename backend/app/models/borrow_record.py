@@ -19,7 +19,8 @@ class BorrowRecord(Base):
     Transactional record linking Members to Books.
     Acts as the source of truth for active and historical borrows, due dates, and return timestamps.
     Includes a partial index on (book_id, member_id) to efficiently enforce business rules
-    preventing members from concurrently borrowing the same book multiple times.
+    preventing members from concurrently borrowing the same book multiple times, and a
+    covering (member_id, status, borrowed_at DESC) index for member-scoped lookups.
     """
 
     __tablename__: str = "borrow_record"  # type: ignore
@@ -29,7 +30,7 @@ class BorrowRecord(Base):
         UUID(as_uuid=True), ForeignKey("book.id", ondelete="CASCADE"), nullable=False, index=True
     )
     member_id = Column(
-        UUID(as_uuid=True), ForeignKey("member.id", ondelete="CASCADE"), nullable=False, index=True
+        UUID(as_uuid=True), ForeignKey("member.id", ondelete="CASCADE"), nullable=False
     )
     borrowed_at = Column(
         DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True
@@ -53,4 +54,13 @@ class BorrowRecord(Base):
             "member_id",
             postgresql_where=(status == BorrowStatus.BORROWED),
         ),
+        # Serves both the active-borrow count and the per-member history listing;
+        # supersedes the single-column member_id index.
+        Index(
+            "ix_borrow_member_status_time",
+            "member_id",
+            "status",
+            borrowed_at.desc(),
+            postgresql_include=["book_id", "due_date", "returned_at"],
+        ),
     )
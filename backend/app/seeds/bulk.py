@@ -0,0 +1,27 @@
+from typing import Any, Dict, List
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def insert_ignoring_conflicts(
+    session: Session, model: Any, rows: List[Dict[str, Any]], conflict_column: str
+) -> int:
+    """
+    Bulk-inserts rows with ON CONFLICT (conflict_column) DO NOTHING.
+    Returns the number of rows actually inserted.
+    """
+    if not rows:
+        return 0
+
+    dialect_insert = _DIALECT_INSERTS[session.get_bind().dialect.name]
+    stmt = (
+        dialect_insert(model)
+        .on_conflict_do_nothing(index_elements=[conflict_column])
+        .returning(model.id)
+    )
+    return len(session.execute(stmt, rows).all())
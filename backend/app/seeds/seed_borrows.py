@@ -3,9 +3,11 @@ import random
 import uuid
 from datetime import timezone
 from faker import Faker
+from sqlalchemy import insert, select
 from app.shared.uow import AbstractUnitOfWork
 from app.models.borrow_record import BorrowRecord, BorrowStatus
 from app.models.book import Book
+from app.models.member import Member
 
 logger = logging.getLogger(__name__)
 
@@ -17,17 +19,26 @@ def seed_borrows(
     overdue_count: int,
     faker: Faker,
 ) -> int:
-    """Seeds borrow records using bulk addition."""
-    total_seeded = 0
-
+    """Seeds borrow records using a single bulk insert."""
     with uow:
-        all_books = uow.books.list(limit=50000)["items"]
-        all_members = uow.members.list(limit=50000)["items"]
+        # Inventory is tracked in memory and written back once at the end.
+        available = dict(
+            uow.session.execute(
+                select(Book.id, Book.available_copies).where(Book.deleted_at.is_(None))
+            ).all()
+        )
+        member_ids = list(
+            uow.session.execute(
+                select(Member.id).where(Member.deleted_at.is_(None))
+            ).scalars()
+        )
 
-    if not all_books or not all_members:
+    if not available or not member_ids:
         logger.warning("No books or members found. Skipping borrow seeding.")
         return 0
 
+    book_ids = list(available)
+
     def get_borrow_dates(scenario: str):
         if scenario == "active":
             return faker.date_time_between(start_date="-547d", end_date="now", tzinfo=timezone.utc), None, BorrowStatus.BORROWED
@@ -39,45 +50,42 @@ def seed_borrows(
             start = faker.date_time_between(start_date="-547d", end_date="-20d", tzinfo=timezone.utc)
             return start, None, BorrowStatus.BORROWED
 
-    with uow:
-        for scenario, count in [("active", active_count), ("returned", returned_count), ("overdue", overdue_count)]:
-            logger.info(f"Seeding {count} {scenario} borrows...")
-            for _ in range(count):
-                book = random.choice(all_books)
-                member = random.choice(all_members)
-                
-                if scenario != "returned" and book.available_copies < 1:
-                    continue
+    rows = []
+    for scenario, count in [("active", active_count), ("returned", returned_count), ("overdue", overdue_count)]:
+        logger.info(f"Seeding {count} {scenario} borrows...")
+        for _ in range(count):
+            book_id = random.choice(book_ids)
+            member_id = random.choice(member_ids)
+
+            if scenario != "returned" and available[book_id] < 1:
+                continue
+
+            borrow_date, return_date, status = get_borrow_dates(scenario)
 
-                borrow_date, return_date, status = get_borrow_dates(scenario)
-                
-                due_date = borrow_date + __import__('datetime').timedelta(days=14)
+            # Adjust availability
+            if status == BorrowStatus.BORROWED:
+                available[book_id] -= 1
 
-                record = BorrowRecord(
-                    id=uuid.uuid4(),
-                    book_id=book.id,
-                    member_id=member.id,
-                    borrowed_at=borrow_date,
-                    due_date=due_date,
-                    returned_at=return_date,
-                    status=status
-                )
-                
-                # Adjust availability
-                if status == BorrowStatus.BORROWED:
-                    book_orm = uow.session.get(Book, book.id)
-                    if book_orm and book_orm.available_copies > 0:
-                        book_orm.available_copies -= 1
-                    else:
-                        continue
-                
-                uow.session.add(record)
-                total_seeded += 1
-                
-                if total_seeded % 500 == 0:
-                    uow.flush()
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "book_id": book_id,
+                    "member_id": member_id,
+                    "borrowed_at": borrow_date,
+                    "due_date": borrow_date + __import__('datetime').timedelta(days=14),
+                    "returned_at": return_date,
+                    "status": status,
+                }
+            )
 
-        uow.commit()
+    if rows:
+        borrowed_ids = {row["book_id"] for row in rows if row["status"] == BorrowStatus.BORROWED}
+        with uow:
+            uow.session.execute(insert(BorrowRecord), rows)
+            # Versioned mapper: write the new counts through the ORM so version_id is bumped.
+            for book in uow.session.execute(select(Book).where(Book.id.in_(borrowed_ids))).scalars():
+                book.available_copies = available[book.id]
+            uow.commit()
 
-    logger.info(f"Successfully seeded {total_seeded} borrow events.")
-    return total_seeded
+    logger.info(f"Successfully seeded {len(rows)} borrow events.")
+    return len(rows)
@@ -3,6 +3,7 @@ import uuid
 from faker import Faker
 from app.shared.uow import AbstractUnitOfWork
 from app.models.member import Member
+from app.seeds.bulk import insert_ignoring_conflicts
 
 logger = logging.getLogger(__name__)
 
@@ -10,34 +11,21 @@ logger = logging.getLogger(__name__)
 def seed_members(uow: AbstractUnitOfWork, count: int, faker: Faker) -> int:
     """
     Seeds members using bulk insertion.
-    Idempotency: Checks if email exists before creating.
+    Idempotency: Rows whose email already exists are skipped via ON CONFLICT DO NOTHING.
     """
-    created_count = 0
     logger.info(f"Seeding {count} members...")
 
-    with uow:
-        existing_emails = {m.email for m in uow.members.list_all()}
-
-    with uow:
-        for _ in range(count):
-            email = faker.unique.email()
-            name = faker.name()
-            phone = faker.phone_number()
+    rows = []
+    for _ in range(count):
+        email = faker.unique.email()
+        name = faker.name()
+        phone = faker.phone_number()
 
-            if email in existing_emails:
-                continue
-
-            member_orm = Member(
-                id=uuid.uuid4(),
-                name=name,
-                email=email,
-                phone=phone
-            )
-            uow.session.add(member_orm)
-            existing_emails.add(email)
-            created_count += 1
+        rows.append({"id": uuid.uuid4(), "name": name, "email": email, "phone": phone})
 
+    with uow:
+        inserted = insert_ignoring_conflicts(uow.session, Member, rows, "email")
         uow.commit()
 
-    logger.info(f"Successfully seeded {created_count} members.")
-    return created_count
+    logger.info(f"Successfully seeded {inserted} members.")
+    return inserted
@@ -34,10 +34,8 @@ def is_db_empty(db: SessionLocal) -> bool:
 def clear_data(db: SessionLocal):
     logger.info("Clearing existing data...")
     try:
-        # Delete in order of dependency
-        db.execute(text("TRUNCATE TABLE borrow_record RESTART IDENTITY CASCADE"))
-        db.execute(text("TRUNCATE TABLE member RESTART IDENTITY CASCADE"))
-        db.execute(text("TRUNCATE TABLE book RESTART IDENTITY CASCADE"))
+        # One statement: a single lock acquisition and no per-table FK walk
+        db.execute(text("TRUNCATE TABLE borrow_record, member, book RESTART IDENTITY CASCADE"))
         db.commit()
         logger.info("Database cleared successfully.")
     except Exception as e:
@@ -0,0 +1,35 @@
+"""add_borrow_member_status_time_index
+
+Revision ID: 3f9a2c7d81b4
+Revises: e51d53eb64ce
+Create Date: 2026-10-16 09:12:31.447120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a2c7d81b4'
+down_revision = 'e51d53eb64ce'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covers both `member_id = ? AND status = 'borrowed'` counts and
+    # `member_id = ? ORDER BY borrowed_at DESC` history pages.
+    op.create_index(
+        'ix_borrow_member_status_time',
+        'borrow_record',
+        ['member_id', 'status', sa.text('borrowed_at DESC')],
+        unique=False,
+        postgresql_include=['book_id', 'due_date', 'returned_at'],
+    )
+    # member_id is now the leading column of the composite index.
+    op.drop_index(op.f('ix_borrow_record_member_id'), table_name='borrow_record')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_borrow_record_member_id'), 'borrow_record', ['member_id'], unique=False)
+    op.drop_index('ix_borrow_member_status_time', table_name='borrow_record')
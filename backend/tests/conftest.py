@@ -1,33 +1,187 @@
+import itertools
+import os
 import pytest
+from types import SimpleNamespace
 from fastapi.testclient import TestClient
 from app.main import app
 from app.models import Base
-from sqlalchemy import create_engine, text
-from sqlalchemy.pool import NullPool
+from app.models.book import Book
+from app.models.member import Member
+from sqlalchemy import create_engine, event, insert, inspect, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.shared.deps import get_uow
-from app.shared.uow import UnitOfWork
+from app.shared.uow import AbstractUnitOfWork, UnitOfWork
+from app.domains.books.service import BookService
+from app.domains.borrows.service import BorrowService
+from app.domains.members.service import MemberService
 from app.core.config import settings
 
-@pytest.fixture(scope="module")
-def shared_engine():
-    """Create a single engine for the module to ensure shared DB."""
+# Unique suffixes for factory-made ISBNs and emails.
+_UNIQUE = itertools.count()
+
+# In-memory SQLite by default; TEST_DB=postgres runs the whole suite against PostgreSQL.
+# Tests marked `postgres` are skipped unless TEST_DB=postgres.
+TEST_DB = os.environ.get("TEST_DB", "sqlite")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "postgres: test relies on PostgreSQL-only SQL (row locks, to_char, ...)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DB == "postgres":
+        return
+    skip_postgres = pytest.mark.skip(reason="needs PostgreSQL; run with TEST_DB=postgres (make test-pg)")
+    for item in items:
+        if item.get_closest_marker("postgres"):
+            item.add_marker(skip_postgres)
+
+
+def _test_database_name() -> str:
+    """One database per pytest-xdist worker (library_test_gw0, ...); library_test otherwise."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return f"library_test_{worker}" if worker else "library_test"
+
+
+def _ensure_database(base_uri: str, name: str) -> None:
+    admin_engine = create_engine(base_uri, isolation_level="AUTOCOMMIT")
+    try:
+        with admin_engine.connect() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": name}
+            ).scalar()
+            if not exists:
+                conn.execute(text(f'CREATE DATABASE "{name}"'))
+    finally:
+        admin_engine.dispose()
+
+
+def _existing_indexes(engine) -> dict:
+    """Map each existing table to its index names, read with one catalog query."""
+    return {
+        table: {index["name"] for index in indexes if not index.get("duplicates_constraint")}
+        for (_, table), indexes in inspect(engine).get_multi_indexes().items()
+    }
+
+
+def _create_schema(engine) -> None:
+    """
+    Build the schema with one catalog query instead of create_all's per-table checks,
+    issuing all DDL in a single transaction. A persistent test database whose tables
+    or indexes differ from the models (e.g. one built before an index change) is
+    dropped and rebuilt.
+    """
+    existing = _existing_indexes(engine)
+    expected = {
+        name: {index.name for index in table.indexes} for name, table in Base.metadata.tables.items()
+    }
+    if all(existing.get(name) == indexes for name, indexes in expected.items()):
+        return
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # The search indexes use gin_trgm_ops; fresh per-worker databases lack the extension.
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        if existing:
+            Base.metadata.drop_all(conn)
+        Base.metadata.create_all(conn, checkfirst=bool(existing))
+
+
+@pytest.fixture(scope="session")
+def sqlite_engine():
+    """Single-connection in-memory SQLite engine; the schema is built in microseconds."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_conn, _):
+        # An in-memory database already journals in memory and never syncs; only
+        # temp b-trees (ORDER BY / GROUP BY spills) still default to temp files.
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    _create_schema(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def postgres_engine():
+    """Create the single pooled PostgreSQL engine shared by every test module and build the schema once."""
     # Build test URI by replacing the DB name
     base_uri = settings.DATABASE_URL
-    test_uri = base_uri.rsplit("/", 1)[0] + "/library_test"
-    
-    engine = create_engine(test_uri, poolclass=NullPool)
-    Base.metadata.create_all(bind=engine)
-    return engine
+    db_name = _test_database_name()
+    _ensure_database(base_uri, db_name)
+    test_uri = base_uri.rsplit("/", 1)[0] + "/" + db_name
+
+    engine = create_engine(test_uri, pool_size=10, max_overflow=20, pool_pre_ping=True)
+    _create_schema(engine)
+    # The database outlives the run; start from empty tables since tests only roll back.
+    _truncate_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def engine(request):
+    """PostgreSQL under TEST_DB=postgres; in-memory SQLite otherwise."""
+    return request.getfixturevalue("postgres_engine" if TEST_DB == "postgres" else "sqlite_engine")
+
 
+def _truncate_all(engine) -> None:
+    """Empty every table, in a single TRUNCATE on PostgreSQL."""
+    tables = list(reversed(Base.metadata.sorted_tables))
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    "TRUNCATE " + ", ".join(t.name for t in tables) + " RESTART IDENTITY CASCADE"
+                )
+            )
+        else:
+            for table in tables:
+                conn.execute(table.delete())
 
-@pytest.fixture(scope="module")
-def session_factory(shared_engine):
-    """Return a session factory bound to the shared engine."""
-    return sessionmaker(autocommit=False, autoflush=False, bind=shared_engine)
 
+@pytest.fixture
+def truncate_tables(engine):
+    """Return a callable that empties every table of the engine selected for this test."""
+    return lambda: _truncate_all(engine)
 
-@pytest.fixture(scope="module")
+
+@pytest.fixture
+def connection(engine):
+    """
+    One connection per test whose outer transaction is rolled back afterwards.
+    Sessions join it through SAVEPOINTs, so commits made by the code under test
+    never reach the database and no cleanup DML is needed between tests.
+    """
+    conn = engine.connect()
+    transaction = conn.begin()
+    if conn.dialect.name == "sqlite":
+        # pysqlite defers BEGIN until the first DML; open the transaction explicitly so
+        # the SAVEPOINTs nest inside it instead of committing on RELEASE.
+        conn.exec_driver_sql("BEGIN")
+    try:
+        yield conn
+    finally:
+        transaction.rollback()
+        conn.close()
+
+
+@pytest.fixture
+def session_factory(connection):
+    """Return a session factory whose sessions commit into the per-test transaction."""
+    return sessionmaker(
+        bind=connection, autoflush=False, join_transaction_mode="create_savepoint"
+    )
+
+
+@pytest.fixture
 def db_session(session_factory):
     """Yield a session for test setup use."""
     session = session_factory()
@@ -37,32 +191,121 @@ def db_session(session_factory):
         session.close()
 
 
+@pytest.fixture
+def bulk_create_books(db_session):
+    """Return a callable that inserts book rows in one executemany INSERT, bypassing the API."""
+
+    def _create(rows):
+        db_session.execute(insert(Book), rows)
+        db_session.commit()
+
+    return _create
+
+
+@pytest.fixture
+def unique():
+    """Return a callable yielding suite-wide unique ints for ISBNs, emails and the like."""
+    return lambda: next(_UNIQUE)
+
+
+@pytest.fixture
+def make_book(db_session):
+    """Return a factory that inserts one book directly and returns its id."""
+
+    def _make(**overrides):
+        n = next(_UNIQUE)
+        values = {
+            "title": f"Book {n}",
+            "author": "Author",
+            "isbn": f"FACT{n}",
+            "total_copies": 1,
+            "available_copies": 1,
+            **overrides,
+        }
+        book_id = db_session.execute(insert(Book).values(**values).returning(Book.id)).scalar_one()
+        db_session.commit()
+        return book_id
+
+    return _make
+
+
+@pytest.fixture
+def make_member(db_session):
+    """Return a factory that inserts one member directly and returns its id."""
+
+    def _make(**overrides):
+        n = next(_UNIQUE)
+        values = {"name": f"Member {n}", "email": f"member_{n}@e.com", **overrides}
+        member_id = db_session.execute(
+            insert(Member).values(**values).returning(Member.id)
+        ).scalar_one()
+        db_session.commit()
+        return member_id
+
+    return _make
+
+
 @pytest.fixture(scope="function")
-def clean_db(session_factory):
-    """Clean all tables before a test using a session to avoid deadlocks."""
-    with session_factory() as session:
-        try:
-            session.execute(text("DELETE FROM auditlog;"))
-            session.execute(text("DELETE FROM borrow_record;"))
-            session.execute(text("DELETE FROM book;"))
-            session.execute(text("DELETE FROM member;"))
-            session.commit()
-        except Exception:
-            session.rollback()
-            raise
+def clean_db(truncate_tables):
+    """
+    Empty all tables before and after a test that commits through the engine itself
+    (e.g. to exercise real row locks across connections) rather than `connection`.
+    """
+    truncate_tables()
+    yield
+    truncate_tables()
 
 
 @pytest.fixture(scope="function")
-def uow(session_factory, clean_db):
-    """Yield a UnitOfWork for test use with function scope, ensures clean DB."""
+def uow(session_factory):
+    """Yield a UnitOfWork for test use, rolled back with the per-test transaction."""
     uow = UnitOfWork(session_factory=session_factory)
     with uow:
         yield uow
 
 
+class FakeUnitOfWork(AbstractUnitOfWork):
+    """UnitOfWork over caller-supplied repository stubs; transaction calls are no-ops."""
+
+    def __init__(self, **repositories):
+        for name, repository in repositories.items():
+            setattr(self, name, repository)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def flush(self):
+        pass
+
+
+@pytest.fixture
+def fake_uow():
+    """Return the FakeUnitOfWork class; call it with e.g. analytics=FakeAnalyticsRepo()."""
+    return FakeUnitOfWork
+
+
+@pytest.fixture(scope="function")
+def services(uow):
+    """Book, member and borrow services sharing the test's UnitOfWork."""
+    return SimpleNamespace(
+        book=BookService(uow), member=MemberService(uow), borrow=BorrowService(uow)
+    )
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    """Start the app (lifespan, routing, dependency graph) once for the whole run."""
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
 @pytest.fixture(scope="function")
-def client(session_factory, clean_db):
-    """Yield a test client that uses a UnitOfWork bound to the test session factory, ensures clean DB."""
+def client(app_client, session_factory):
+    """Yield the shared test client with get_uow bound to this test's session factory."""
 
     def override_get_uow():
         uow = UnitOfWork(session_factory=session_factory)
@@ -70,5 +313,7 @@ def client(session_factory, clean_db):
             yield uow
 
     app.dependency_overrides[get_uow] = override_get_uow
-    with TestClient(app) as c:
-        yield c
+    try:
+        yield app_client
+    finally:
+        app.dependency_overrides.pop(get_uow, None)
@@ -1,67 +1,44 @@
 import pytest
-import threading
-from sqlalchemy import create_engine
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
-from app.models import Base
+from app.models.book import Book
 from app.domains.borrows.service import BorrowService
 from app.domains.books.service import BookService
 from app.domains.members.service import MemberService
 from app.domains.books.schemas import BookCreate
 from app.domains.members.schemas import MemberCreate
-from app.core.config import settings
 from app.core.exceptions import (
     InventoryUnavailableError,
-    BorrowLimitExceededError,
     AlreadyReturnedError,
     ActiveBorrowExistsError,
 )
 from app.shared.uow import UnitOfWork
 
-_test_uri = settings.DATABASE_URL.rsplit("/", 1)[0] + "/library_test"
-
-# Use the uow fixture from conftest.py instead of local session.
-
 
 # -----------------------------------------------------------------------------
 # 1. Unit Tests for Service Layer (Business Logic & Invariants)
 # -----------------------------------------------------------------------------
 
 
-def test_borrow_invariants(uow):
+def test_borrow_invariants(uow, services, make_book, make_member):
     """
     Verifies that borrowing maintains inventory invariants:
     - Available copies decrement by 1.
     - Borrow record is created with 'borrowed' status.
     """
-    borrow_svc = BorrowService(uow)
-    book_svc = BookService(uow)
-    member_svc = MemberService(uow)
-
-    # Setup
-    book = book_svc.create_book(
-        BookCreate(
-            title="Invariant Book",
-            author="A",
-            isbn="INV1",
-            total_copies=5,
-            available_copies=5,
-        )
-    )
-    member = member_svc.create_member(
-        MemberCreate(name="Inv Member", email="inv@e.com")
-    )
+    book_id = make_book()
+    member_id = make_member()
 
     # Action
-    borrow_svc.borrow_book(book.id, member.id)
+    services.borrow.borrow_book(book_id, member_id)
 
     # Assert Invariants
-    book_fresh = book_svc.get_book(book.id)
-    assert book_fresh.available_copies == 4, (
+    assert services.book.get_book(book_id).available_copies == 0, (
         "Invariant Violated: Available copies did not decrement."
     )
 
-    borrows_result = uow.borrows.list(member_id=member.id)
-    borrows = borrows_result["items"]
+    borrows = uow.borrows.list(member_id=member_id)["items"]
     assert len(borrows) == 1
     assert borrows[0].status == "borrowed"
 
@@ -71,182 +48,92 @@ def test_borrow_invariants(uow):
 # -----------------------------------------------------------------------------
 
 
-def test_full_borrow_return_cycle(uow):
+def test_full_borrow_return_cycle(services, make_book, make_member):
     """
     Tests the complete lifecycle: Borrow -> Return -> Inventory Restoration.
     """
-    borrow_svc = BorrowService(uow)
-    book_svc = BookService(uow)
-    member_svc = MemberService(uow)
-
-    book = book_svc.create_book(
-        BookCreate(
-            title="Flow Book",
-            author="A",
-            isbn="FL1",
-            total_copies=1,
-            available_copies=1,
-        )
-    )
-    member = member_svc.create_member(
-        MemberCreate(name="Flow Member", email="flow@e.com")
-    )
+    book_id = make_book()
+    member_id = make_member()
 
     # Borrow
-    record = borrow_svc.borrow_book(book.id, member.id)
+    record = services.borrow.borrow_book(book_id, member_id)
     assert record.status == "borrowed"
-    assert book_svc.get_book(book.id).available_copies == 0
+    assert services.book.get_book(book_id).available_copies == 0
 
     # Return
-    returned = borrow_svc.return_book(record.id)
+    returned = services.borrow.return_book(record.id)
     assert returned.status == "returned"
-    assert book_svc.get_book(book.id).available_copies == 1
+    assert services.book.get_book(book_id).available_copies == 1
 
 
 # -----------------------------------------------------------------------------
-# 3. Concurrency Simulation Test (Race Condition)
+# 3. Double Return Test
 # -----------------------------------------------------------------------------
 
 
-def test_concurrent_borrow_race_condition():
-    """
-    Simulates a race condition where two threads attempt to borrow
-    the LAST available copy of a book.
-    Expected: Exactly one thread succeeds, the other fails.
-    """
-    # Use separate sessions for concurrency simulation
-    concurrent_engine = create_engine(_test_uri)
-    ConcurrentSessionLocal = sessionmaker(
-        autocommit=False, autoflush=False, bind=concurrent_engine
-    )
-
-    # Setup Data (Outside threads)
-    Base.metadata.create_all(bind=concurrent_engine)
-    setup_uow = UnitOfWork(ConcurrentSessionLocal)
-    book_svc = BookService(setup_uow)
-    member_svc = MemberService(setup_uow)
-
-    book = book_svc.create_book(
-        BookCreate(
-            title="Race Book",
-            author="A",
-            isbn="RACE1",
-            total_copies=1,
-            available_copies=1,
-        )
-    )
-    member1 = member_svc.create_member(MemberCreate(name="Racer 1", email="r1@e.com"))
-    member2 = member_svc.create_member(MemberCreate(name="Racer 2", email="r2@e.com"))
-
-    book_id = book.id
-    m1_id = member1.id
-    m2_id = member2.id
-    # No need to close setup_uow explicitly if it's just a wrapper, 
-    # but we should ensure the session is disposed if we created one.
-    # Actually setup_uow created a session.
-
-    results = []
-
-    def attempt_borrow(member_id):
-        from app.shared.uow import UnitOfWork
-        uow_local = UnitOfWork(ConcurrentSessionLocal)
-        svc = BorrowService(uow_local)
-        try:
-            svc.borrow_book(book_id, member_id)
-            results.append("success")
-        except InventoryUnavailableError:
-            results.append("inventory_error")
-        except Exception as e:
-            results.append(f"error: {e}")
-
-    t1 = threading.Thread(target=attempt_borrow, args=(m1_id,))
-    t2 = threading.Thread(target=attempt_borrow, args=(m2_id,))
-
-    t1.start()
-    t2.start()
-    t1.join()
-    t2.join()
-
-    # Avoid dropping tables here as it breaks subsequent tests in the same suite
-    # Base.metadata.drop_all(bind=concurrent_engine)
-
-    assert results.count("success") == 1, (
-        f"Expected 1 success, got {results.count('success')} | Full: {results}"
-    )
-    assert results.count("inventory_error") == 1, (
-        f"Expected 1 inventory error, got {results.count('inventory_error')} | Full: {results}"
-    )
-
-
-# -----------------------------------------------------------------------------
-# 4. Double Return Test
-# -----------------------------------------------------------------------------
-
-
-def test_double_return_prevention(uow):
+def test_double_return_prevention(services, make_book, make_member):
     """
     Ensures a book cannot be returned twice (idempotency/error handling).
     """
-    borrow_svc = BorrowService(uow)
-    book_svc = BookService(uow)
-    member_svc = MemberService(uow)
-
-    book = book_svc.create_book(
-        BookCreate(
-            title="Ret Book", author="A", isbn="RT1", total_copies=1, available_copies=1
-        )
-    )
-    member = member_svc.create_member(
-        MemberCreate(name="Ret Member", email="ret@e.com")
-    )
-
-    record = borrow_svc.borrow_book(book.id, member.id)
+    book_id = make_book()
+    record = services.borrow.borrow_book(book_id, make_member())
 
     # First Return - Success
-    borrow_svc.return_book(record.id)
+    services.borrow.return_book(record.id)
 
     # Second Return - Failure
     with pytest.raises(AlreadyReturnedError):
-        borrow_svc.return_book(record.id)
+        services.borrow.return_book(record.id)
 
     # Invariant: Inventory stays at 1 (not 2)
-    assert book_svc.get_book(book.id).available_copies == 1
+    assert services.book.get_book(book_id).available_copies == 1
 
 
 # -----------------------------------------------------------------------------
-# 5. Borrow Limit Enforcement Test
+# 4. Concurrency Simulation Test (Race Condition)
 # -----------------------------------------------------------------------------
 
 
-def test_borrow_limit_enforcement(uow):
+@pytest.mark.postgres
+def test_concurrent_borrow_race_condition(engine, clean_db):
     """
-    Ensures a member cannot borrow more than 5 books.
+    Deterministically replays the race for the LAST available copy of a book:
+    the first borrower holds the row lock, a competing transaction cannot acquire it,
+    and once the first borrow commits the second borrower sees no inventory left.
     """
-    borrow_svc = BorrowService(uow)
-    book_svc = BookService(uow)
-    member_svc = MemberService(uow)
-
-    member = member_svc.create_member(MemberCreate(name="Max Mem", email="max@e.com"))
-
-    # Fill quota (5 books)
-    for i in range(5):
-        book = book_svc.create_book(
-            BookCreate(
-                title=f"B{i}",
-                author="A",
-                isbn=f"MAX{i}",
-                total_copies=1,
-                available_copies=1,
-            )
-        )
-        borrow_svc.borrow_book(book.id, member.id)
+    # Independent connections are required for real lock contention.
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    setup_uow = UnitOfWork(session_factory)
+    book_svc = BookService(setup_uow)
+    member_svc = MemberService(setup_uow)
 
-    # Attempt 6th
-    book6 = book_svc.create_book(
+    book = book_svc.create_book(
         BookCreate(
-            title="B6", author="A", isbn="MAX6", total_copies=1, available_copies=1
+            title="Race Book",
+            author="A",
+            isbn="RACE1",
+            total_copies=1,
+            available_copies=1,
         )
     )
+    member1 = member_svc.create_member(MemberCreate(name="Racer 1", email="r1@e.com"))
+    member2 = member_svc.create_member(MemberCreate(name="Racer 2", email="r2@e.com"))
+
+    first = UnitOfWork(session_factory)
+    with first:
+        assert first.books.get_with_lock(book.id) is not None
 
-    with pytest.raises(BorrowLimitExceededError):
-        borrow_svc.borrow_book(book6.id, member.id)
+        # While the row lock is held, a competing transaction cannot read it for update.
+        with session_factory() as contender:
+            with pytest.raises(OperationalError):
+                contender.execute(
+                    select(Book).where(Book.id == book.id).with_for_update(nowait=True)
+                )
+
+        # The first borrower completes and its commit releases the lock.
+        BorrowService(first).borrow_book(book.id, member1.id)
+
+    with pytest.raises(InventoryUnavailableError):
+        BorrowService(UnitOfWork(session_factory)).borrow_book(book.id, member2.id)
+
+    assert book_svc.get_book(book.id).available_copies == 0
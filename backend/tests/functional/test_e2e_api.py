@@ -36,10 +36,11 @@ def test_full_borrow_flow(client):
     borrow_id = borrow_data["id"]
 
     # 4. Validate Invariants after Borrow
-    # Inventory should be 1
-    book_check = client.get(f"/api/v1/books/{book_id}")
-    assert book_check.json()["available_copies"] == 1
-    assert book_check.json()["available_copies"] >= 0  # "Inventory never negative"
+    # Inventory should be 1; the borrow response already carries the updated book
+    book_after_borrow = borrow_data["book"]
+    assert book_after_borrow["id"] == book_id
+    assert book_after_borrow["available_copies"] == 1
+    assert book_after_borrow["available_copies"] >= 0  # "Inventory never negative"
 
     # Active Borrows should be 1
     borrows_res = client.get(f"/api/v1/members/{member_id}/borrows/")
@@ -49,17 +50,18 @@ def test_full_borrow_flow(client):
     assert len(active_borrows) == 1
 
     # Active borrows (1) <= Total (2)
-    assert len(active_borrows) <= book_check.json()["total_copies"]
+    assert len(active_borrows) <= book_after_borrow["total_copies"]
 
     # 5. Return Book
     return_res = client.post(f"/api/v1/borrows/{borrow_id}/return/")
     assert return_res.status_code == 200
-    assert return_res.json()["status"] == "returned"
+    return_data = return_res.json()
+    assert return_data["status"] == "returned"
 
     # 6. Validate Resotration & Invariants
     # Inventory should be restored to 2
-    book_check = client.get(f"/api/v1/books/{book_id}")
-    assert book_check.json()["available_copies"] == 2
+    book_after_return = return_data["book"]
+    assert book_after_return["available_copies"] == 2
 
     # Active Borrows should be 0
     borrows_res = client.get(f"/api/v1/members/{member_id}/borrows/")
@@ -69,4 +71,4 @@ def test_full_borrow_flow(client):
 
     # Final Invariant Check
     # Active borrows (0) <= Total (2)
-    assert 0 <= book_check.json()["total_copies"]
+    assert 0 <= book_after_return["total_copies"]
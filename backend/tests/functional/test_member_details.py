@@ -1,16 +1,20 @@
 import pytest
-from uuid import uuid4
+from sqlalchemy import insert
 from datetime import datetime, timezone, timedelta
 from app.domains.members.schemas import MemberCreate
 from app.domains.members.service import MemberService
 from app.domains.books.schemas import BookCreate
 from app.domains.books.service import BookService
 from app.domains.borrows.service import BorrowService
-from app.models.borrow_record import BorrowStatus
+from app.models.borrow_record import BorrowRecord, BorrowStatus
 
-def test_get_member_core_details(client, uow):
+# Built once; executemany seeding reuses the statement and its cached compiled form.
+_INSERT_BORROW = insert(BorrowRecord)
+
+
+def test_get_member_core_details(client, uow, unique):
     member_service = MemberService(uow)
-    member = member_service.create_member(MemberCreate(name="Test Member", email=f"test_{uuid4()}@example.com"))
+    member = member_service.create_member(MemberCreate(name="Test Member", email=f"test_{unique()}@example.com"))
     
     response = client.get(f"/api/v1/members/{member.id}")
     assert response.status_code == 200
@@ -20,40 +24,59 @@ def test_get_member_core_details(client, uow):
     assert "active_borrows_count" in data
 
 
-def test_get_member_borrow_history_pagination(client, uow):
+@pytest.mark.parametrize("limit,total", [(1, 2), (5, 6), (10, 11)])
+def test_get_member_borrow_history_pagination(client, uow, unique, limit, total):
     member_service = MemberService(uow)
     book_service = BookService(uow)
-    borrow_service = BorrowService(uow)
 
-    member = member_service.create_member(MemberCreate(name="History Member", email=f"hist_{uuid4()}@test.com"))
-    book = book_service.create_book(BookCreate(title="History Book", author="Auth", isbn=str(uuid4())))
+    member = member_service.create_member(MemberCreate(name="History Member", email=f"hist_{unique()}@test.com"))
+    book = book_service.create_book(BookCreate(title="History Book", author="Auth", isbn=f"ISBN{unique()}"))
 
-    # Seed 15 records
-    for i in range(15):
-        b = borrow_service.borrow_book(book.id, member.id)
-        borrow_service.return_book(b.id)
+    # Seed limit + 1 returned records in a single executemany INSERT: one row past the page boundary
+    now = datetime.now(timezone.utc)
+    one_day = timedelta(days=1)
+    loan_period = timedelta(days=14)
+    returned = BorrowStatus.RETURNED
+    rows = []
+    for i in range(total):
+        borrowed_at = now - timedelta(days=i + 2)
+        rows.append(
+            {
+                "book_id": book.id,
+                "member_id": member.id,
+                "borrowed_at": borrowed_at,
+                "due_date": borrowed_at + loan_period,
+                "returned_at": borrowed_at + one_day,
+                "status": returned,
+            }
+        )
+    uow.session.execute(_INSERT_BORROW, rows)
+    uow.commit()
 
     # Test Page 1
-    response = client.get(f"/api/v1/members/{member.id}/borrows/?limit=10&offset=0")
+    response = client.get(f"/api/v1/members/{member.id}/borrows/?limit={limit}&offset=0")
     assert response.status_code == 200
     data = response.json()
-    assert len(data["data"]) == 10
-    assert data["meta"]["total"] >= 15
+    assert len(data["data"]) == limit
+    assert data["meta"]["total"] == total
+    assert data["meta"]["has_more"] is True
 
     # Test Page 2
-    response = client.get(f"/api/v1/members/{member.id}/borrows/?limit=10&offset=10")
+    response = client.get(f"/api/v1/members/{member.id}/borrows/?limit={limit}&offset={limit}")
     assert response.status_code == 200
     data = response.json()
-    assert len(data["data"]) == 5
+    assert len(data["data"]) == total - limit
+    assert data["meta"]["has_more"] is False
 
 
-def test_get_member_analytics(client, uow):
+@pytest.mark.postgres
+def test_get_member_analytics(client, uow, unique):
     member_service = MemberService(uow)
     book_service = BookService(uow)
     borrow_service = BorrowService(uow)
 
-    member = member_service.create_member(MemberCreate(name="Analytics Member", email=f"ana_{uuid4()}@test.com"))
-    book = book_service.create_book(BookCreate(title="Analytics Book", author="Auth", isbn=str(uuid4()), total_copies=10, available_copies=10))
+    member = member_service.create_member(MemberCreate(name="Analytics Member", email=f"ana_{unique()}@test.com"))
+    book = book_service.create_book(BookCreate(title="Analytics Book", author="Auth", isbn=f"ISBN{unique()}", total_copies=10, available_copies=10))
 
     # One returned
     b1 = borrow_service.borrow_book(book.id, member.id)
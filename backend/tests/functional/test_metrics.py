@@ -1,10 +1,8 @@
-def test_metrics_collection(client):
-    # 1. Check initial state
+def test_metrics_collection(client, unique):
+    # 1. Snapshot initial state; all deltas are asserted against one final scrape
     res = client.get("/metrics")
     assert res.status_code == 200
-    initial_success = res.json()["borrow_success_count"]
-    initial_failure = res.json()["borrow_failure_count"]
-    initial_active = res.json()["active_borrows_gauge"]
+    before = res.json()
 
     # 2. Perform successful borrow
     # Setup
@@ -19,40 +17,31 @@ def test_metrics_collection(client):
         },
     )
     book_id = b_res.json()["id"]
-    import uuid
-
     m_res = client.post(
-        "/api/v1/members/", json={"name": "Met Mem", "email": f"met_{uuid.uuid4()}@e.com"}
+        "/api/v1/members/", json={"name": "Met Mem", "email": f"met_{unique()}@e.com"}
     )
     member_id = m_res.json()["id"]
 
-    client.post(f"/api/v1/members/{member_id}/borrows/?book_id={book_id}")
-
-    # Verify increment
-    res = client.get("/metrics")
-    assert res.json()["borrow_success_count"] == initial_success + 1
-    assert res.json()["active_borrows_gauge"] == initial_active + 1
+    res = client.post(f"/api/v1/members/{member_id}/borrows/?book_id={book_id}")
+    assert res.status_code == 201
 
     # 3. Perform failed borrow (No Inventory)
     # Book has 0 copies now
-    import uuid
-
     m2_res = client.post(
-        "/api/v1/members/", json={"name": "Met Mem 2", "email": f"met2_{uuid.uuid4()}@e.com"}
+        "/api/v1/members/", json={"name": "Met Mem 2", "email": f"met2_{unique()}@e.com"}
     )
     member2_id = m2_res.json()["id"]
 
-    client.post(f"/api/v1/members/{member2_id}/borrows/?book_id={book_id}")
-
-    # Verify failure increment
-    res = client.get("/metrics")
-    assert res.json()["borrow_failure_count"] == initial_failure + 1
+    res = client.post(f"/api/v1/members/{member2_id}/borrows/?book_id={book_id}")
+    assert res.status_code == 409  # InventoryUnavailableError
 
     # 4. Return book
     borrow_res = client.get(f"/api/v1/members/{member_id}/borrows/")
     borrow_id = borrow_res.json()["data"][0]["id"]
     client.post(f"/api/v1/borrows/{borrow_id}/return/")
 
-    # Verify decrement
-    res = client.get("/metrics")
-    assert res.json()["active_borrows_gauge"] == initial_active
+    # Verify one success, one failure, and the gauge back where it started
+    after = client.get("/metrics").json()
+    assert after["borrow_success_count"] == before["borrow_success_count"] + 1
+    assert after["borrow_failure_count"] == before["borrow_failure_count"] + 1
+    assert after["active_borrows_gauge"] == before["active_borrows_gauge"]
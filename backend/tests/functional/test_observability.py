@@ -1,14 +1,12 @@
 import pytest
-import logging
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 from sqlalchemy.exc import OperationalError
+from app.domains.books.schemas import BookCreate
+from app.domains.books.service import BookService
 from app.domains.borrows.service import BorrowService
 from app.domains.borrows.schemas import BorrowRecordResponse
-
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.models import Base
-from app.core.config import settings
+from app.domains.members.schemas import MemberCreate
+from app.domains.members.service import MemberService
 
 # Use uow fixture from conftest.py
 
@@ -22,16 +20,10 @@ def test_health_check_db_status(client):
     assert data["db"] == "connected"
 
 
-def test_correlation_id_middleware(client, caplog):
-    """Validate logs contain correlation ID."""
-    caplog.set_level(logging.INFO)
-
-    # 1. Request with explicit ID
+def test_correlation_id_middleware(client):
+    """Validate the correlation ID is echoed back or generated."""
+    # 1. Request with explicit ID, echoed back in the response header
     custom_id = "test-cor-id-123"
-    client.get("/health", headers={"X-Correlation-ID": custom_id})
-
-    # Verify correlation ID is echoed back in response header
-
     res = client.get("/health", headers={"X-Correlation-ID": custom_id})
     assert res.headers["X-Correlation-ID"] == custom_id
 
@@ -44,46 +36,24 @@ def test_correlation_id_middleware(client, caplog):
 def test_deadlock_retry_mechanism(uow):
     """
     Validate deadlock retry works by forcing an OperationalError.
-    We mock the repository to raise OperationalError twice, then succeed.
+    Only the row lock is patched to fail twice; everything else runs against the real session.
     """
     borrow_service = BorrowService(uow)
-
-    # Side effect: 2 OperationalErrors, then a mock book to verify retry behavior
-    mock_book = MagicMock()
-    mock_book.available_copies = 1
-    mock_book.id = 1
+    book = BookService(uow).create_book(
+        BookCreate(title="Retry Book", author="A", isbn="RETRY1", total_copies=1, available_copies=1)
+    )
+    member = MemberService(uow).create_member(MemberCreate(name="Retry Member", email="retry@e.com"))
 
     side_effect = [
         OperationalError("statement", {}, "deadlock detected"),
         OperationalError("statement", {}, "deadlock detected"),
-        mock_book,
+        uow.books.get(book.id),
     ]
 
-    with patch.object(
-        uow.books, "get_with_lock", side_effect=side_effect
-    ) as mock_method:
-        with patch.object(
-            uow.borrows, "list", return_value={"items": [], "total": 0}
-        ):
-            with patch.object(uow.members, "get", return_value=True):
-                with patch.object(
-                    uow.borrows, "get_active_borrow", return_value=None
-                ):
-                    # Mock session.refresh to set an ID on the record
-                    def refresh_side_effect(instance):
-                        instance.id = uuid.uuid4()
-
-                    with patch.object(uow.session, "add"):
-                        with patch.object(uow.session, "commit"):
-                            with patch.object(
-                                uow.session,
-                                "refresh",
-                                side_effect=refresh_side_effect,
-                            ):
-                                # We mock session methods to avoid actual DB calls on the mocked book object
-                                import uuid
-
-                                borrow_service.borrow_book(uuid.uuid4(), uuid.uuid4())
+    with patch.object(uow.books, "get_with_lock", side_effect=side_effect) as mock_method:
+        record = borrow_service.borrow_book(book.id, member.id)
 
-                    # verification: called 3 times (2 fails + 1 success)
-                    assert mock_method.call_count == 3
+    assert record.status == "borrowed"
+    assert uow.books.get(book.id).available_copies == 0
+    # verification: called 3 times (2 fails + 1 success)
+    assert mock_method.call_count == 3
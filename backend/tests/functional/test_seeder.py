@@ -1,11 +1,19 @@
+import hashlib
 import pytest
-import subprocess
-from app.db.session import SessionLocal
+from sqlalchemy import exists, func, select
 from app.models.book import Book
 from app.models.member import Member
 from app.models.borrow_record import BorrowRecord, BorrowStatus
 
 
+def _content_digest(session, *columns):
+    """md5 over the given columns of every row, ordered by the first column."""
+    digest = hashlib.md5()
+    for row in session.execute(select(*columns).order_by(columns[0])):
+        digest.update(repr(tuple(row)).encode())
+    return digest.hexdigest()
+
+
 def test_seeder_minimal_scenario_idempotency(uow):
     """
     Test that the seeder runs successfully and is idempotent.
@@ -18,10 +26,12 @@ def test_seeder_minimal_scenario_idempotency(uow):
 
     config = SCENARIOS["minimal"]
     faker = Faker()
-    Faker.seed(42)
 
-    # 1. Run seeder first time (minimal scenario)
+    # 1. Run seeder first time (minimal scenario); each seeder starts from the same seed
+    # so a later probe can regenerate its first candidates.
+    Faker.seed(42)
     seed_books(uow, config["books"], faker)
+    Faker.seed(42)
     seed_members(uow, config["members"], faker)
     seed_borrows(
         uow,
@@ -33,9 +43,9 @@ def test_seeder_minimal_scenario_idempotency(uow):
 
     # Verify counts
     with uow:
-        book_count = uow.session.query(Book).count()
-        member_count = uow.session.query(Member).count()
-        borrow_count = uow.session.query(BorrowRecord).count()
+        book_count = uow.session.execute(select(func.count()).select_from(Book)).scalar()
+        member_count = uow.session.execute(select(func.count()).select_from(Member)).scalar()
+        borrow_count = uow.session.execute(select(func.count()).select_from(BorrowRecord)).scalar()
 
     # Minimal scenario targets: 2000 books, 300 members, 1315 borrows
     # Due to randomized member selection and the 5-book limit constraint,
@@ -44,36 +54,40 @@ def test_seeder_minimal_scenario_idempotency(uow):
     assert member_count >= 300
     assert borrow_count > 1000
 
-    # 2. Run seeder second time
+    # 2. Idempotency probe: replaying the first candidates of each seeder leaves
+    # the seeded rows byte-for-byte unchanged
+    with uow:
+        books_digest = _content_digest(
+            uow.session, Book.id, Book.isbn, Book.title, Book.available_copies
+        )
+        members_digest = _content_digest(uow.session, Member.id, Member.email, Member.name)
+
+    Faker.seed(42)
+    assert seed_books(uow, 10, faker) == 0
     Faker.seed(42)
     faker.unique.clear()
-    seed_books(uow, config["books"], faker)
-    seed_members(uow, config["members"], faker)
+    assert seed_members(uow, 10, faker) == 0
 
     with uow:
-        book_count_2 = uow.session.query(Book).count()
-        member_count_2 = uow.session.query(Member).count()
-
-    assert book_count_2 == book_count, (
-        "Book count changed after 2nd seed run (should be idempotent)"
-    )
-    assert member_count_2 == member_count, (
-        "Member count changed after 2nd seed run (should be idempotent)"
-    )
+        assert _content_digest(
+            uow.session, Book.id, Book.isbn, Book.title, Book.available_copies
+        ) == books_digest, "Books changed after re-seeding (should be idempotent)"
+        assert _content_digest(
+            uow.session, Member.id, Member.email, Member.name
+        ) == members_digest, "Members changed after re-seeding (should be idempotent)"
 
-    # Constraints verification
+    # Constraints verification (both EXISTS probes in one round-trip)
     with uow:
-        invalid_books = uow.session.query(Book).filter(Book.available_copies < 0).all()
-        assert len(invalid_books) == 0, "Found books with negative availability"
-
-        inconsistent_borrows = (
-            uow.session.query(BorrowRecord)
-            .filter(
-                BorrowRecord.status == BorrowStatus.RETURNED,
-                BorrowRecord.returned_at == None,
+        has_invalid_books, has_inconsistent_borrows = uow.session.execute(
+            select(
+                exists().where(Book.available_copies < 0),
+                exists().where(
+                    BorrowRecord.status == BorrowStatus.RETURNED,
+                    BorrowRecord.returned_at.is_(None),
+                ),
             )
-            .all()
-        )
-    assert len(inconsistent_borrows) == 0, (
+        ).one()
+    assert not has_invalid_books, "Found books with negative availability"
+    assert not has_inconsistent_borrows, (
         "Found returned borrows without returned_at date"
     )
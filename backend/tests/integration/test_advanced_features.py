@@ -1,21 +1,20 @@
-from fastapi.testclient import TestClient
-from app.main import app
 import pytest
 
 
-def test_pagination(client):
+def test_pagination(client, bulk_create_books):
     # Seed 25 books
-    for i in range(25):
-        client.post(
-            "/api/v1/books/",
-            json={
+    bulk_create_books(
+        [
+            {
                 "title": f"Book {i}",
                 "author": "Auth",
                 "isbn": f"PAG{i}",
                 "total_copies": 1,
                 "available_copies": 1,
-            },
-        )
+            }
+            for i in range(25)
+        ]
+    )
 
     # Page 1 (limit 20, offset 0)
     response = client.get("/api/v1/books/?limit=20&offset=0")
@@ -26,6 +25,18 @@ def test_pagination(client):
     assert data["meta"]["limit"] == 20
     assert data["meta"]["offset"] == 0
     assert data["meta"]["has_more"] is True
+    next_cursor = data["meta"]["next_cursor"]
+    assert next_cursor is not None
+    page1_ids = {b["id"] for b in data["data"]}
+
+    # Page 2 via keyset cursor: same 5 remaining rows, no OFFSET scan
+    response = client.get("/api/v1/books/", params={"limit": 20, "cursor": next_cursor})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["data"]) == 5
+    assert page1_ids.isdisjoint(b["id"] for b in data["data"])
+    assert data["meta"]["has_more"] is False
+    assert data["meta"]["next_cursor"] is None
 
     # Page 2 (limit 20, offset 20)
     response = client.get("/api/v1/books/?limit=20&offset=20")
@@ -40,25 +51,13 @@ def test_pagination(client):
     assert data["meta"]["has_more"] is False
 
 
-def test_search(client):
+def test_search(client, bulk_create_books):
     # Seed specific books
-    client.post(
-        "/api/v1/books/",
-        json={
-            "title": "Unique Python Guide",
-            "author": "Guido",
-            "isbn": "PY1",
-            "total_copies": 1,
-        },
-    )
-    client.post(
-        "/api/v1/books/",
-        json={
-            "title": "Rust Programming",
-            "author": "Steve",
-            "isbn": "RS1",
-            "total_copies": 1,
-        },
+    bulk_create_books(
+        [
+            {"title": "Unique Python Guide", "author": "Guido", "isbn": "PY1", "total_copies": 1},
+            {"title": "Rust Programming", "author": "Steve", "isbn": "RS1", "total_copies": 1},
+        ]
     )
 
     # Search "Python"
@@ -77,19 +76,14 @@ def test_search(client):
     assert items[0]["title"] == "Rust Programming"
 
 
-def test_sorting(client):
+def test_sorting(client, bulk_create_books):
     # A, B, C titles
-    client.post(
-        "/api/v1/books/",
-        json={"title": "Aalpha", "author": "X", "isbn": "S1", "total_copies": 1},
-    )
-    client.post(
-        "/api/v1/books/",
-        json={"title": "Ccharlie", "author": "X", "isbn": "S2", "total_copies": 1},
-    )
-    client.post(
-        "/api/v1/books/",
-        json={"title": "Bbravo", "author": "X", "isbn": "S3", "total_copies": 1},
+    bulk_create_books(
+        [
+            {"title": "Aalpha", "author": "X", "isbn": "S1", "total_copies": 1},
+            {"title": "Ccharlie", "author": "X", "isbn": "S2", "total_copies": 1},
+            {"title": "Bbravo", "author": "X", "isbn": "S3", "total_copies": 1},
+        ]
     )
 
     # Sort A-Z
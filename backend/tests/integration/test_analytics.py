@@ -1,17 +1,16 @@
 import pytest
-from datetime import datetime, timedelta, date
-from unittest.mock import MagicMock, patch
+from datetime import date
 from app.domains.analytics.schemas import (
     AnalyticsOverview,
     OverdueBreakdown,
     TopMember,
     InventoryHealth,
     DailyActiveMember,
-    BorrowForecast,
     PopularBook,
     RecentActivity,
 )
-from app.domains.analytics.service import AnalyticsService
+from app.main import app
+from app.shared.deps import get_uow
 
 # Mock Data
 MOCK_OVERVIEW = AnalyticsOverview(
@@ -23,36 +22,52 @@ MOCK_INVENTORY = InventoryHealth(
     low_stock_books=5, never_borrowed_books=10, fully_unavailable_books=2
 )
 MOCK_DAM = [DailyActiveMember(date=date.today(), count=15)]
-MOCK_FORECAST = {
-    "projected_next_7_days_total": 42,
-    "daily_projection": 6,
-}  # Dict from Repo
+MOCK_DAILY_BORROWS = {date.today(): 7}  # Dict from Repo
+MOCK_POPULAR = [PopularBook(book_id="b1", title="Book 1", author="A1", borrow_count=5)]
+MOCK_RECENT = [
+    RecentActivity(id="1", type="borrow", book_title="Book 1", member_name="Alice", timestamp="2024-01-01T12:00:00")
+]
+
+
+class FakeAnalyticsRepo:
+    """Returns the MOCK_* values above; AnalyticsService still builds the summary from them."""
+
+    def get_overview_stats(self, start_date, end_date):
+        return MOCK_OVERVIEW
+
+    def get_overdue_breakdown(self):
+        return MOCK_OVERDUE
+
+    def get_inventory_health(self):
+        return MOCK_INVENTORY
+
+    def get_most_active_members(self, start_date, end_date, limit=5):
+        return MOCK_TOP_MEMBERS
+
+    def get_daily_active_members(self, start_date, end_date):
+        return MOCK_DAM
+
+    def get_popular_books(self, limit=5):
+        return MOCK_POPULAR
+
+    def get_recent_activity(self, limit=10):
+        return MOCK_RECENT
+
+    def get_daily_borrow_counts(self, start_date, end_date):
+        return MOCK_DAILY_BORROWS
 
 
 @pytest.fixture
-def mock_uow():
-    with patch("app.domains.analytics.router.AnalyticsService") as MockService:
-        service_instance = MockService.return_value
-        # Mock the summary response
-        from app.domains.analytics.schemas import AnalyticsSummaryResponse
-        summary = AnalyticsSummaryResponse(
-            overview=MOCK_OVERVIEW,
-            overdue_breakdown=MOCK_OVERDUE,
-            inventory_health=MOCK_INVENTORY,
-            top_members=MOCK_TOP_MEMBERS,
-            daily_active_members=MOCK_DAM,
-            daily_borrows=[],
-            forecast=BorrowForecast(projected_next_7_days_total=7, daily_projection=1),
-            popular_books=[PopularBook(book_id="b1", title="Book 1", author="A1", borrow_count=5)],
-            recent_activity=[RecentActivity(id="1", type="borrow", book_title="Book 1", member_name="Alice", timestamp="2024-01-01T12:00:00")],
-            generated_at=datetime.now().isoformat()
-        )
-        service_instance.get_summary.return_value = summary
-        yield service_instance
+def mock_uow(client, fake_uow):
+    """Serve the analytics route from FakeAnalyticsRepo through the get_uow dependency."""
+    previous = app.dependency_overrides.get(get_uow)
+    app.dependency_overrides[get_uow] = lambda: fake_uow(analytics=FakeAnalyticsRepo())
+    yield
+    app.dependency_overrides[get_uow] = previous
 
 
 def test_analytics_summary_structure(client, mock_uow):
-    """Test API structure using mocked service."""
+    """Test API structure using a stubbed analytics repository."""
     response = client.get("/api/v1/analytics/summary")
     assert response.status_code == 200
     data = response.json()
@@ -62,15 +77,21 @@ def test_analytics_summary_structure(client, mock_uow):
     assert data["top_members"][0]["name"] == "Alice"
     assert data["popular_books"][0]["title"] == "Book 1"
     assert data["recent_activity"][0]["type"] == "borrow"
+    assert data["forecast"]["projected_next_7_days_total"] == 7
 
 
-def test_date_filter_validation(client, mock_uow):
+@pytest.mark.parametrize(
+    "query,expected_status",
+    [
+        ("from=2025-01-10&to=2025-01-01", 400),  # Invalid: Start > End
+        ("from=2025-01-01&to=2025-01-10", 200),
+        ("from=2025-01-01", 200),
+        ("to=2025-01-10", 200),
+    ],
+)
+def test_date_filter_validation(client, mock_uow, query, expected_status):
     """Test valid and invalid date ranges."""
-    # Invalid: Start > End
-    response = client.get("/api/v1/analytics/summary?from=2025-01-10&to=2025-01-01")
-    assert response.status_code == 400
-    assert "Start date cannot be after end date" in response.json()["detail"]
-
-    # Valid (Mock will be called)
-    response = client.get("/api/v1/analytics/summary?from=2025-01-01&to=2025-01-10")
-    assert response.status_code == 200
+    response = client.get(f"/api/v1/analytics/summary?{query}")
+    assert response.status_code == expected_status
+    if expected_status == 400:
+        assert "Start date cannot be after end date" in response.json()["detail"]
@@ -1,5 +1,3 @@
-from fastapi.testclient import TestClient
-from app.main import app
 import pytest
 
 
@@ -49,10 +47,8 @@ def test_books_api(client):
     assert response.status_code == 404
 
 
-def test_members_api(client):
-    import uuid
-
-    email = f"api_{uuid.uuid4()}@e.com"
+def test_members_api(client, unique):
+    email = f"api_{unique()}@e.com"
     member_data = {"name": "API Mem", "email": email}
     response = client.post("/api/v1/members/", json=member_data)
     assert response.status_code == 201
@@ -73,25 +69,10 @@ def test_members_api(client):
     assert response.json()["member"]["id"] == member_id
 
 
-def test_borrows_api(client):
+def test_borrows_api(client, make_book, make_member):
     # Setup Data
-    book_res = client.post(
-        "/api/v1/books/",
-        json={
-            "title": "Bflow",
-            "author": "A",
-            "isbn": "BF1",
-            "total_copies": 2,
-            "available_copies": 2,
-        },
-    )
-    book_id = book_res.json()["id"]
-    import uuid
-
-    member_res = client.post(
-        "/api/v1/members/", json={"name": "Mflow", "email": f"mf_{uuid.uuid4()}@e.com"}
-    )
-    member_id = member_res.json()["id"]
+    book_id = make_book(title="Bflow", author="A", isbn="BF1", total_copies=2, available_copies=2)
+    member_id = make_member(name="Mflow")
 
     # 1. Borrow Book
     response = client.post(f"/api/v1/members/{member_id}/borrows/?book_id={book_id}")
@@ -133,25 +114,11 @@ def test_borrows_api(client):
     assert "already returned" in response.json()["detail"].lower()
 
 
-def test_borrow_edge_cases_api(client):
+def test_borrow_edge_cases_api(client, make_book, make_member):
     # Setup
-    book_res = client.post(
-        "/api/v1/books/",
-        json={
-            "title": "Edge",
-            "author": "A",
-            "isbn": "EDGE1",
-            "total_copies": 1,
-            "available_copies": 1,
-        },
-    )
-    book_id = book_res.json()["id"]
-    import uuid
-
-    member_res = client.post(
-        "/api/v1/members/", json={"name": "Edge Mem", "email": f"edge_{uuid.uuid4()}@e.com"}
-    )
-    member_id = member_res.json()["id"]
+    book_id = make_book(title="Edge", author="A", isbn="EDGE1")
+    member_id = make_member(name="Edge Mem")
+    member2_id = make_member(name="Edge Mem 2")
 
     # 1. Invalid Member w/ Valid Book
     bad_mem_id = "00000000-0000-0000-0000-000000000000"
@@ -172,12 +139,6 @@ def test_borrow_edge_cases_api(client):
     response = client.post(f"/api/v1/members/{member_id}/borrows/?book_id={book_id}")
     # Same member borrowing same book again triggers ActiveBorrowExistsError (409).
     # To test InventoryUnavailableError, use a different member.
-
-    member2_res = client.post(
-        "/api/v1/members/", json={"name": "Edge Mem 2", "email": f"edge2_{uuid.uuid4()}@e.com"}
-    )
-    member2_id = member2_res.json()["id"]
-
     response = client.post(f"/api/v1/members/{member2_id}/borrows/?book_id={book_id}")
     assert response.status_code == 409
     assert "no copies available" in response.json()["detail"].lower()
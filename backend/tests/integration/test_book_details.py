@@ -7,6 +7,7 @@ from app.domains.members.schemas import MemberCreate
 from app.domains.members.service import MemberService
 from app.domains.books.service import BookService
 
+@pytest.mark.postgres
 def test_get_book_details_full_lifecycle(client, uow):
     # Setup real data using uow
     book_service = BookService(uow)
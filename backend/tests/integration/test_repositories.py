@@ -6,22 +6,9 @@ from app.domains.borrows.repository import BorrowRepository
 from app.domains.books.schemas import BookCreate, BookUpdate
 from app.domains.members.schemas import MemberCreate
 from app.domains.borrows.schemas import BorrowRecordCreate
-from app.models import Base
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL.rsplit("/", 1)[0] + "/library_test")
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-@pytest.fixture(scope="module")
-def db_session():
-    Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
-    yield session
-    session.close()
-    Base.metadata.drop_all(bind=engine)
+# db_session from conftest.py joins a per-test transaction that is rolled back,
+# so nothing written here outlives the test.
 
 
 def test_book_repository(db_session):
@@ -58,34 +45,34 @@ def test_member_repository(db_session):
     assert email_member is not None
 
 
-def test_borrow_repository(db_session):
-    book_repo = BookRepository(db_session)
-    member_repo = MemberRepository(db_session)
+def test_borrow_repository(db_session, make_book, make_member):
     borrow_repo = BorrowRepository(db_session)
 
-    book = book_repo.create(BookCreate(title="B1", author="A1", isbn="111"))
-    member = member_repo.create(MemberCreate(name="M1", email="m1@e.com"))
+    # Book and member repositories are covered above; seed these rows directly
+    book_id = make_book(title="B1", author="A1", isbn="111")
+    member_id = make_member(name="M1", email="m1@e.com")
 
-    borrow_in = BorrowRecordCreate(book_id=book.id, member_id=member.id)
+    borrow_in = BorrowRecordCreate(book_id=book_id, member_id=member_id)
     borrow_record = borrow_repo.create(borrow_in)
 
     assert borrow_record.id is not None
     assert borrow_record.status == "borrowed"
 
-    active_borrow = borrow_repo.get_active_borrow(book.id, member.id)
+    active_borrow = borrow_repo.get_active_borrow(book_id, member_id)
     assert active_borrow is not None
     assert active_borrow.id == borrow_record.id
 
     from app.models.borrow_record import BorrowStatus
 
     active_list_result = borrow_repo.list(
-        member_id=member.id, status=BorrowStatus.BORROWED
+        member_id=member_id, status=BorrowStatus.BORROWED
     )
     active_list = active_list_result["items"]
     assert len(active_list) == 1
     assert active_list[0].id == borrow_record.id
 
 
+@pytest.mark.postgres
 def test_book_locking(db_session):
     repo = BookRepository(db_session)
     book_in = BookCreate(title="Lock Book", author="Lock Author", isbn="locked123")
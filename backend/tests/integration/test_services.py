@@ -1,19 +1,33 @@
-import pytest
 import uuid
-from app.domains.borrows.service import BorrowService
-from app.domains.books.service import BookService
-from app.domains.members.service import MemberService
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert
+from app.models.book import Book
+from app.models.borrow_record import BorrowRecord, BorrowStatus
+from app.models.member import Member
 from app.domains.books.schemas import BookCreate
 from app.domains.members.schemas import MemberCreate
 
 
-def test_borrow_service_flow(uow):
-    borrow_service = BorrowService(uow)
-    book_service = BookService(uow)
-    member_service = MemberService(uow)
+def _insert_returned_borrow(uow, book_id, member_id):
+    """Seed a completed borrow in one INSERT + COMMIT instead of borrow then return."""
+    borrowed_at = datetime.now(timezone.utc) - timedelta(days=3)
+    uow.session.execute(
+        insert(BorrowRecord).values(
+            book_id=book_id,
+            member_id=member_id,
+            borrowed_at=borrowed_at,
+            due_date=borrowed_at + timedelta(days=14),
+            returned_at=borrowed_at + timedelta(days=2),
+            status=BorrowStatus.RETURNED,
+        )
+    )
+    uow.commit()
+
 
+def test_borrow_service_flow(services):
     # Setup data
-    book = book_service.create_book(
+    book = services.book.create_book(
         BookCreate(
             title="Svc Book",
             author="Auth",
@@ -22,105 +36,102 @@ def test_borrow_service_flow(uow):
             available_copies=2,
         )
     )
-    member = member_service.create_member(
+    member = services.member.create_member(
         MemberCreate(name="Svc Member", email="svc@e.com")
     )
 
     # 1. Successful Borrow
-    borrow_record = borrow_service.borrow_book(book.id, member.id)
+    borrow_record = services.borrow.borrow_book(book.id, member.id)
     assert borrow_record.id is not None
     assert borrow_record.status == "borrowed"
 
     # Verify inventory decremented
-    book_refreshed = book_service.get_book(book.id)
+    book_refreshed = services.book.get_book(book.id)
     assert book_refreshed.available_copies == 1
 
     # 2. Return Service
-    returned_record = borrow_service.return_book(borrow_record.id)
+    returned_record = services.borrow.return_book(borrow_record.id)
     assert returned_record.status == "returned"
     assert returned_record.returned_at is not None
 
     # Verify inventory incremented
-    book_refreshed = book_service.get_book(book.id)
+    book_refreshed = services.book.get_book(book.id)
     assert book_refreshed.available_copies == 2
 
 
-def test_borrow_limits(uow):
-    borrow_service = BorrowService(uow)
-    book_service = BookService(uow)
-    member_service = MemberService(uow)
-
-    member = member_service.create_member(
-        MemberCreate(name="Limit Mem", email="limit@e.com")
+def test_borrow_limits(uow, services, unique):
+    """A member can hold at most 5 active borrows; the 6th is refused."""
+    n = unique()
+    member_id = uuid.uuid4()
+    book_ids = [uuid.uuid4() for _ in range(6)]
+    borrowed_at = datetime.now(timezone.utc)
+
+    # Seed the member, six books and a full quota of five active borrows in one commit
+    uow.session.execute(insert(Member).values(id=member_id, name=f"Limit {n}", email=f"limit_{n}@e.com"))
+    uow.session.execute(
+        insert(Book),
+        [
+            {
+                "id": book_id,
+                "title": f"Limit Book {i}",
+                "author": "Author",
+                "isbn": f"LIMIT{n}-{i}",
+                "total_copies": 1,
+                "available_copies": 0 if i < 5 else 1,
+            }
+            for i, book_id in enumerate(book_ids)
+        ],
     )
-
-    # Borrow 5 books
-    for i in range(5):
-        book = book_service.create_book(
-            BookCreate(
-                title=f"B{i}",
-                author="A",
-                isbn=f"L{i}",
-                total_copies=1,
-                available_copies=1,
-            )
-        )
-        borrow_service.borrow_book(book.id, member.id)
-
-    # Try 6th borrow
-    book6 = book_service.create_book(
-        BookCreate(
-            title="B6", author="A", isbn="L6", total_copies=1, available_copies=1
-        )
+    uow.session.execute(
+        insert(BorrowRecord),
+        [
+            {
+                "book_id": book_id,
+                "member_id": member_id,
+                "borrowed_at": borrowed_at,
+                "due_date": borrowed_at + timedelta(days=14),
+                "status": BorrowStatus.BORROWED,
+            }
+            for book_id in book_ids[:5]
+        ],
     )
+    uow.commit()
 
     from app.core.exceptions import BorrowLimitExceededError
 
     with pytest.raises(BorrowLimitExceededError):
-        borrow_service.borrow_book(book6.id, member.id)
-
+        services.borrow.borrow_book(book_ids[5], member_id)
 
-def test_no_inventory(uow):
-    borrow_service = BorrowService(uow)
-    book_service = BookService(uow)
-    member_service = MemberService(uow)
 
-    book = book_service.create_book(
-        BookCreate(
-            title="Empty", author="A", isbn="E1", total_copies=1, available_copies=0
-        )
-    )
-    member = member_service.create_member(MemberCreate(name="Mem", email="e@e.com"))
+def test_no_inventory(services, make_book, make_member):
+    book_id = make_book(total_copies=1, available_copies=0)
+    member_id = make_member()
 
     from app.core.exceptions import InventoryUnavailableError
 
     with pytest.raises(InventoryUnavailableError):
-        borrow_service.borrow_book(book.id, member.id)
+        services.borrow.borrow_book(book_id, member_id)
 
 
-def test_book_service_details_consolidation(uow):
-    book_service = BookService(uow)
-    borrow_service = BorrowService(uow)
-    member_service = MemberService(uow)
-    
+@pytest.mark.postgres
+def test_book_service_details_consolidation(uow, services):
     # Setup data
-    book = book_service.create_book(
+    book = services.book.create_book(
         BookCreate(title="Consolidated Book", author="Author", isbn="C1", total_copies=5, available_copies=5)
     )
-    member = member_service.create_member(
+    member = services.member.create_member(
         MemberCreate(name="Tester", email="test@e.com")
     )
 
     # 1. Active borrow (Member 1)
-    b1 = borrow_service.borrow_book(book.id, member.id)
+    b1 = services.borrow.borrow_book(book.id, member.id)
     
-    # 2. Returned borrow (Member 2)
-    member2 = member_service.create_member(MemberCreate(name="Tester 2", email="test2@e.com"))
-    b2 = borrow_service.borrow_book(book.id, member2.id)
-    borrow_service.return_book(b2.id)
+    # 2. Returned borrow (Member 2), seeded as one already-returned row
+    member2 = services.member.create_member(MemberCreate(name="Tester 2", email="test2@e.com"))
+    _insert_returned_borrow(uow, book.id, member2.id)
     
     # Test Service Method
-    details = book_service.get_book_details(book.id)
+    details = services.book.get_book_details(book.id)
     
     assert details.book.id == book.id
     assert len(details.current_borrowers) == 1
@@ -129,31 +140,73 @@ def test_book_service_details_consolidation(uow):
     assert details.analytics.total_times_borrowed == 2
 
 
-def test_member_service_details_consolidation(uow):
-    member_service = MemberService(uow)
-    book_service = BookService(uow)
-    
+@pytest.mark.postgres
+def test_member_service_details_consolidation(uow, services):
     # Setup data
-    member = member_service.create_member(MemberCreate(name="Member Detail Test", email="detail@test.com"))
-    book = book_service.create_book(BookCreate(title="B1", author="A1", isbn="ISBN1"))
+    member = services.member.create_member(MemberCreate(name="Member Detail Test", email="detail@test.com"))
+    book = services.book.create_book(BookCreate(title="B1", author="A1", isbn="ISBN1"))
     
-    # Borrow and return for history
-    from app.domains.borrows.service import BorrowService
-    borrow_service = BorrowService(uow)
-    b1 = borrow_service.borrow_book(book.id, member.id)
-    borrow_service.return_book(b1.id)
+    # Returned borrow for history, seeded as one already-returned row
+    _insert_returned_borrow(uow, book.id, member.id)
     
     # Test Details
-    core = member_service.get_member_details(member.id)
+    core = services.member.get_member_details(member.id)
     assert core.member.id == member.id
     assert core.analytics_summary.total_books_borrowed == 1
     
     # Test History
-    history_res = member_service.get_member_borrow_history(member.id, limit=10, offset=0, status="all", sort="borrowed_at", order="desc")
+    history_res = services.member.get_member_borrow_history(member.id, limit=10, offset=0, status="all", sort="borrowed_at", order="desc")
     assert history_res.meta["total"] == 1
     assert history_res.data[0].book_title == "B1"
     
     # Test Analytics
-    analytics = member_service.get_member_analytics(member.id)
+    analytics = services.member.get_member_analytics(member.id)
     assert analytics.total_books_borrowed == 1
     assert analytics.risk_level in ["LOW", "MEDIUM", "HIGH"]
+
+
+def test_member_details_cache_invalidated_by_borrow_and_return(services, make_book, make_member):
+    """Borrowing and returning invalidate the cached member details (portable SQL only)."""
+    book_id = make_book()
+    member_id = make_member()
+
+    assert services.member.get_member_details(member_id).active_borrows_count == 0
+
+    record = services.borrow.borrow_book(book_id, member_id)
+    assert services.member.get_member_details(member_id).active_borrows_count == 1
+
+    services.borrow.return_book(record.id)
+    assert services.member.get_member_details(member_id).active_borrows_count == 0
+
+
+@pytest.mark.postgres
+def test_member_reads_reflect_borrow_and_return(services, make_book, make_member):
+    """Borrowing and returning invalidate the cached member details and analytics."""
+    book_id = make_book()
+    member_id = make_member()
+
+    # Prime both caches
+    assert services.member.get_member_details(member_id).active_borrows_count == 0
+    assert services.member.get_member_analytics(member_id).total_books_borrowed == 0
+
+    record = services.borrow.borrow_book(book_id, member_id)
+    details = services.member.get_member_details(member_id)
+    assert details.active_borrows_count == 1
+    assert details.analytics_summary.total_books_borrowed == 1
+    analytics = services.member.get_member_analytics(member_id)
+    assert analytics.total_books_borrowed == 1
+    assert analytics.active_books == 1
+
+    services.borrow.return_book(record.id)
+    assert services.member.get_member_details(member_id).active_borrows_count == 0
+    assert services.member.get_member_analytics(member_id).active_books == 0
+
+
+@pytest.mark.postgres
+def test_member_analytics_cache_hands_out_copies(services, make_member):
+    member_id = make_member()
+
+    first = services.member.get_member_analytics(member_id)
+    first.total_books_borrowed = 99
+
+    assert services.member.get_member_analytics(member_id).total_books_borrowed == 0
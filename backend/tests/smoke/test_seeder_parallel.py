@@ -1,5 +1,6 @@
 import logging
 import sys
+import pytest
 import os
 from faker import Faker
 
@@ -15,11 +16,10 @@ logging.basicConfig(level=logging.INFO)
 
 def clear_data(db):
     print("Clearing existing data...")
-    db.execute(text("TRUNCATE TABLE borrow_record RESTART IDENTITY CASCADE"))
-    db.execute(text("TRUNCATE TABLE member RESTART IDENTITY CASCADE"))
-    db.execute(text("TRUNCATE TABLE book RESTART IDENTITY CASCADE"))
+    db.execute(text("TRUNCATE TABLE borrow_record, member, book RESTART IDENTITY CASCADE"))
     db.commit()
 
+@pytest.mark.postgres
 def test_parallel_seeder():
     db = SessionLocal()
     faker = Faker()
@@ -1,6 +1,4 @@
 import pytest
-from app.main import app
-from fastapi.testclient import TestClient
 
 def test_root_health(client):
     response = client.get("/health")
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+from app.domains.books.schemas import (
+    BookAnalytics,
+    BookDetailResponse,
+    BorrowerInfo,
+    BorrowHistoryItem,
+)
+from app.domains.books.service import BookService
+
+NOW = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+MOCK_BOOK = SimpleNamespace(
+    id=uuid4(),
+    title="Unit Book",
+    author="Author",
+    isbn="U1",
+    total_copies=5,
+    available_copies=4,
+    created_at=NOW,
+    updated_at=NOW,
+)
+MOCK_BORROWERS = [
+    BorrowerInfo(
+        borrow_id=uuid4(), member_id=uuid4(), name="Alice", borrowed_at=NOW, days_until_due=14
+    )
+]
+MOCK_HISTORY = [
+    BorrowHistoryItem(
+        member_id=uuid4(), member_name="Bob", borrowed_at=NOW, returned_at=NOW, duration_days=0
+    )
+]
+MOCK_ANALYTICS = BookAnalytics(
+    total_times_borrowed=2,
+    average_borrow_duration=0.0,
+    last_borrowed_at=NOW,
+    popularity_rank=1,
+    availability_status="AVAILABLE",
+)
+
+
+class FakeBookRepo:
+    """Serves MOCK_BOOK and its borrow data; any other id is not found."""
+
+    def get_with_lock(self, book_id):
+        return MOCK_BOOK if book_id == MOCK_BOOK.id else None
+
+    def get_current_borrowers(self, book_id):
+        return MOCK_BORROWERS
+
+    def get_borrow_history(self, book_id, limit, offset):
+        return MOCK_HISTORY, len(MOCK_HISTORY)
+
+
+class FakeAnalyticsRepo:
+    def get_book_analytics(self, book_id, book):
+        return MOCK_ANALYTICS
+
+
+def test_get_book_details_service_unit(fake_uow):
+    """Service-level shape check without the HTTP stack or a database."""
+    uow = fake_uow(books=FakeBookRepo(), analytics=FakeAnalyticsRepo())
+    details = BookService(uow).get_book_details(MOCK_BOOK.id)
+
+    assert isinstance(details, BookDetailResponse)
+    assert details.book.title == "Unit Book"
+    assert details.current_borrowers == MOCK_BORROWERS
+    assert details.borrow_history.data == MOCK_HISTORY
+    assert details.borrow_history.meta == {
+        "total": 1, "limit": 10, "offset": 0, "has_more": False
+    }
+    assert details.analytics == MOCK_ANALYTICS
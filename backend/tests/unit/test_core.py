@@ -8,3 +8,34 @@ def test_settings_loaded():
     from app.core.config import settings
 
     assert settings.DATABASE_URL is not None
+
+
+def test_ttl_cache_expiry_and_eviction():
+    from app.core.cache import TTLCache
+
+    cache = TTLCache(maxsize=2, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts least recently used ("b")
+    assert cache.get("b") is None
+    assert cache.pop("a") == 1
+    assert cache.get("a") is None
+
+    expired = TTLCache(ttl=0)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+
+
+def test_member_cache_invalidation():
+    from app.core.cache import (
+        member_analytics_cache,
+        member_stats_cache,
+        invalidate_member_caches,
+    )
+
+    member_analytics_cache.set("m1", "analytics")
+    member_stats_cache.set("m1", {"active_borrows_count": 0})
+    invalidate_member_caches("m1")
+    assert member_analytics_cache.get("m1") is None
+    assert member_stats_cache.get("m1") is None
@@ -1,8 +1,5 @@
 import pytest
 from uuid import uuid4
-from app.domains.borrows.service import BorrowService
-from app.domains.books.service import BookService
-from app.domains.members.service import MemberService
 from app.domains.books.repository import BookRepository
 from app.domains.books.schemas import BookCreate, BookUpdate
 from app.domains.members.schemas import MemberCreate
@@ -14,51 +11,37 @@ from app.core.exceptions import (
 )
 
 
-def test_borrow_service_edge_cases(uow):
-    borrow_service = BorrowService(uow)
-    book_service = BookService(uow)
-    member_service = MemberService(uow)
-
+def test_borrow_service_edge_cases(uow, services, make_book, make_member):
     # Setup
-    book = book_service.create_book(
-        BookCreate(
-            title="Edge Book",
-            author="A",
-            isbn="Edge1",
-            total_copies=5,
-            available_copies=5,
-        )
-    )
-    member = member_service.create_member(
-        MemberCreate(name="Edge Member", email="edge@e.com")
-    )
+    book_id = make_book(total_copies=5, available_copies=5)
+    member_id = make_member()
 
     # 1. Borrow with invalid member
     with pytest.raises(MemberNotFoundError):
-        borrow_service.borrow_book(book.id, uuid4())
+        services.borrow.borrow_book(book_id, uuid4())
 
     # 2. Borrow with invalid book
     with pytest.raises(BookNotFoundError):
-        borrow_service.borrow_book(uuid4(), member.id)
+        services.borrow.borrow_book(uuid4(), member_id)
 
     # 3. Double borrow (same book)
-    borrow_service.borrow_book(book.id, member.id)
+    services.borrow.borrow_book(book_id, member_id)
     from app.core.exceptions import ActiveBorrowExistsError
 
     with pytest.raises(ActiveBorrowExistsError):
-        borrow_service.borrow_book(book.id, member.id)
+        services.borrow.borrow_book(book_id, member_id)
 
     # 4. Return invalid borrow/record
     with pytest.raises(BorrowRecordNotFoundError):
-        borrow_service.return_book(uuid4())
+        services.borrow.return_book(uuid4())
 
     # 5. Return already returned
-    borrow = uow.borrows.get_active_borrow(book.id, member.id)
+    borrow = uow.borrows.get_active_borrow(book_id, member_id)
     # Return once
-    borrow_service.return_book(borrow.id)
+    services.borrow.return_book(borrow.id)
     # Return again
     with pytest.raises(AlreadyReturnedError):
-        borrow_service.return_book(borrow.id)
+        services.borrow.return_book(borrow.id)
 
 
 def test_book_repository_edge_cases(uow):
@@ -81,21 +64,18 @@ def test_book_repository_edge_cases(uow):
     assert isinstance(result["items"], list)
 
 
-def test_service_wrappers(uow):
-    book_svc = BookService(uow)
-    member_svc = MemberService(uow)
-
+def test_service_wrappers(uow, services):
     # Book Service Coverage
-    b = book_svc.create_book(BookCreate(title="SVC List", author="A", isbn="LST1"))
-    assert len(book_svc.list_books().data) > 0
-    assert book_svc.get_book_by_isbn("LST1") is not None
-    assert book_svc.update_book(b.id, BookUpdate(title="Upd")) is not None
+    b = services.book.create_book(BookCreate(title="SVC List", author="A", isbn="LST1"))
+    assert len(services.book.list_books().data) > 0
+    assert services.book.get_book_by_isbn("LST1") is not None
+    assert services.book.update_book(b.id, BookUpdate(title="Upd")) is not None
 
     # Member Service Coverage
-    m = member_svc.create_member(MemberCreate(name="Mem List", email="lst@e.com"))
-    assert len(member_svc.list_members().data) > 0
-    assert member_svc.get_member(m.id) is not None
-    assert member_svc.get_member_by_email("lst@e.com") is not None
+    m = services.member.create_member(MemberCreate(name="Mem List", email="lst@e.com"))
+    assert len(services.member.list_members().data) > 0
+    assert services.member.get_member(m.id) is not None
+    assert services.member.get_member_by_email("lst@e.com") is not None
     assert uow.members.get_by_email("nonexistent") is None
 
 
@@ -4,22 +4,13 @@ from sqlalchemy.exc import IntegrityError
 from app.models.book import Book
 from app.models.member import Member
 from app.models.borrow_record import BorrowRecord, BorrowStatus
-from app.models.base import Base
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL.rsplit("/", 1)[0] + "/library_test")
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-
-@pytest.fixture(scope="module")
-def db():
-    Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
     yield session
     session.close()
-    Base.metadata.drop_all(bind=engine)
 
 
 def test_create_book(db):
@@ -34,16 +25,12 @@ def test_create_book(db):
 
 
 def test_book_copies_constraint(db):
-    try:
-        book = Book(
-            title="Bad Book", author="Author", isbn="0987654321", total_copies=-1
-        )
-        db.add(book)
+    book = Book(title="Bad Book", author="Author", isbn="0987654321", total_copies=-1)
+    db.add(book)
+
+    with pytest.raises(IntegrityError):
         db.commit()
-    except IntegrityError:
-        db.rollback()
-    except Exception:
-        db.rollback()
+    db.rollback()
 
 
 def test_negative_inventory_fails(db):
@@ -51,16 +38,11 @@ def test_negative_inventory_fails(db):
         title="Test", author="A", isbn="11111", total_copies=5, available_copies=-1
     )
     db.add(book)
-    try:
+
+    # Both PostgreSQL and SQLite enforce the CHECK constraint
+    with pytest.raises(IntegrityError):
         db.commit()
-        # PostgreSQL enforces CHECK constraints — this should raise IntegrityError
-        pass
-    except IntegrityError:
-        db.rollback()
-        return
-    except Exception:
-        db.rollback()
-        return
+    db.rollback()
 
 
 def test_duplicate_isbn_fails(db):
@@ -1,61 +1,66 @@
-import unittest
-from unittest.mock import MagicMock
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
 from uuid import uuid4
-from sqlalchemy.orm import Session
 from app.domains.books.repository import BookRepository
-from app.domains.books.schemas import BookCreate, BookResponse
+from app.domains.books.schemas import BookCreate
 from app.models.book import Book
 
+# Fixed values keep the stubs deterministic and free of clock reads
+NOW = datetime(2024, 1, 1)
+MOCK_ID = uuid4()
+# The repository only reads these, so one instance of each serves every run
+BOOK_IN = BookCreate(title="Mock Book", author="Mock Author", isbn="12345")
+MOCK_BOOK = Book(
+    id=MOCK_ID,
+    title="Test",
+    author="A",
+    isbn="1",
+    total_copies=1,
+    available_copies=1,
+    created_at=NOW,
+    updated_at=NOW,
+)
 
-class TestBookRepositoryMock(unittest.TestCase):
-    def setUp(self):
-        self.mock_session = MagicMock(spec=Session)
-        self.repo = BookRepository(self.mock_session)
 
-    def test_create_book(self):
-        book_in = BookCreate(title="Mock Book", author="Mock Author", isbn="12345")
+def assert_calls(mock, *names):
+    """Assert the mock received exactly these method calls, in this order."""
+    assert [name for name, _, _ in mock.mock_calls] == list(names)
 
-        def mock_refresh(obj):
-            obj.id = uuid4()
-            from datetime import datetime
 
-            obj.created_at = datetime.now()
-            obj.updated_at = datetime.now()
+def _refresh(obj):
+    """Stand-in for Session.refresh: stamp the server-generated columns."""
+    obj.id = MOCK_ID
+    obj.created_at = obj.updated_at = NOW
 
-        self.mock_session.refresh.side_effect = mock_refresh
 
-        result = self.repo.create(book_in)
+@pytest.fixture
+def mock_session():
+    return Mock()
 
-        self.mock_session.add.assert_called()
-        self.mock_session.flush.assert_called_once()
-        self.mock_session.refresh.assert_called_once()
-        self.assertIsInstance(result, Book)
-        self.assertEqual(result.title, "Mock Book")
-        self.assertIsNotNone(result.id)
-        self.assertIsNotNone(result.created_at)
 
-    def test_get_book(self):
-        book_id = uuid4()
-        from datetime import datetime
+@pytest.fixture
+def repo(mock_session):
+    return BookRepository(mock_session)
 
-        now = datetime.now()
-        mock_book = Book(
-            id=book_id,
-            title="Test",
-            author="A",
-            isbn="1",
-            total_copies=1,
-            available_copies=1,
-            created_at=now,
-            updated_at=now,
-        )
 
-        self.mock_session.execute.return_value.scalar_one_or_none.return_value = (
-            mock_book
-        )
+def test_create_book(repo, mock_session):
+    mock_session.refresh = Mock(wraps=_refresh)
 
-        result = self.repo.get(book_id)
+    result = repo.create(BOOK_IN)
 
-        self.mock_session.execute.assert_called_once()
-        self.assertIsNotNone(result)
-        self.assertEqual(result.id, book_id)
+    assert_calls(mock_session, "add", "flush", "refresh")
+    assert isinstance(result, Book)
+    assert result.title == "Mock Book"
+    assert result.id == MOCK_ID
+    assert result.created_at == NOW
+
+
+def test_get_book(repo, mock_session):
+    mock_session.execute.return_value.scalar_one_or_none.return_value = MOCK_BOOK
+
+    result = repo.get(MOCK_BOOK.id)
+
+    mock_session.execute.assert_called_once()
+    assert result is not None
+    assert result.id == MOCK_BOOK.id